@@ -4,16 +4,86 @@ Discord Webhook Adapter for Alertmanager
 Translates Alertmanager webhook format to Discord webhook format
 """
 
-import json
+import asyncio
+import logging
 import os
+import signal
 import sys
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from collections import deque
 from datetime import datetime
-import requests
+from itertools import islice
+import aiohttp
+import orjson
+from aiohttp import web
+
+logger = logging.getLogger('discord-adapter')
 
 # Discord webhook URL from environment
 DISCORD_WEBHOOK_URL = os.environ.get('DISCORD_WEBHOOK_URL', '')
 
+# Shared outbound HTTP session, created in on_startup and closed in on_cleanup
+SESSION = None
+
+# Outbound connection pool and retry tuning for Discord POSTs. The batch
+# sender keeps at most one POST in flight, so a few warm connections suffice.
+POOL_MAXSIZE = 4
+SESSION_HEADERS = {
+    'Content-Type': 'application/json',
+    'User-Agent': 'hallmonitor-discord-adapter/1.0'
+}
+SESSION_TIMEOUT = aiohttp.ClientTimeout(total=10, sock_connect=3.05)
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_AFTER = 30  # Upper bound in seconds on a Discord Retry-After wait
+
+# Maximum webhooks processed concurrently; extra requests are shed with 503
+WEBHOOK_CONCURRENCY = int(os.environ.get('WEBHOOK_CONCURRENCY', 8))
+INFLIGHT_KEY = web.AppKey('inflight', asyncio.Semaphore)
+
+# Inbound alerts are coalesced over a debounce window and sent in chunks of
+# MAX_EMBEDS, one POST per chunk
+DEBOUNCE_MS = int(os.environ.get('WEBHOOK_DEBOUNCE_MS', 500))
+MIN_SEND_INTERVAL = 0.25  # Seconds between Discord POSTs (5/s rate limit)
+# Webhooks are rejected once this many alerts are queued. A webhook accepted
+# below the limit is queued whole, so the queue can briefly exceed it.
+QUEUE_MAXSIZE = int(os.environ.get('WEBHOOK_QUEUE_SIZE', 1000))
+ALERT_QUEUE_KEY = web.AppKey('alert_queue', asyncio.Queue)
+BATCHER_KEY = web.AppKey('batcher', asyncio.Task)
+
+# Worker processes sharing the listening port via SO_REUSEPORT. Each worker
+# batches and rate-limits on its own, so keep this at 1 unless inbound
+# parsing is the bottleneck.
+WEBHOOK_WORKERS = int(os.environ.get('WEBHOOK_WORKERS', 1))
+
+# Largest accepted webhook body in bytes
+MAX_BODY = 1 << 20
+
+# Preserialized response bodies
+_QUEUED = b'{"status":"queued"}'
+_BUSY = b'{"status":"busy"}'
+_TOO_LARGE = b'{"status":"error","message":"request body too large"}'
+_BAD_REQUEST = b'{"status":"error","message":"malformed alerts payload"}'
+_NOT_CONFIGURED = b'{"status":"error","message":"DISCORD_WEBHOOK_URL not configured"}'
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "Discord Webhook Adapter",
+    "webhook_configured": bool(DISCORD_WEBHOOK_URL)
+})
+
+# Discord limit: 10 embeds per message
+MAX_EMBEDS = 10
+
+# Static part of every Discord webhook payload
+_PAYLOAD_TEMPLATE = {
+    "username": "Hall Monitor Alerts",
+    "avatar_url": "https://raw.githubusercontent.com/prometheus/prometheus/main/documentation/images/prometheus-logo.svg"
+}
+
+# Summary format for firing alerts, singular form for exactly one
+_FIRING_SUMMARY = {1: "🔥 {} alert firing"}
+_FIRING_SUMMARY_PLURAL = "🔥 {} alerts firing"
+
 # Color codes for Discord embeds
 COLORS = {
     'critical': 0xFF0000,  # Red
@@ -22,43 +92,48 @@ COLORS = {
     'resolved': 0x00FF00   # Green
 }
 
-def format_alert_for_discord(alert):
+# Embed (color, title prefix) keyed by (status, severity); None matches any severity
+_STATUS_STYLE = {
+    ('resolved', None): (COLORS['resolved'], "✅ RESOLVED"),
+    ('firing', 'critical'): (COLORS['critical'], "🔥 CRITICAL"),
+    ('firing', 'warning'): (COLORS['warning'], "⚠️ WARNING"),
+}
+_DEFAULT_STYLE = (COLORS['info'], "ℹ️ INFO")
+
+# Labels already shown in dedicated embed fields
+_SKIP_LABELS = frozenset({'alertname', 'severity', 'monitor', 'component'})
+
+def format_alert_for_discord(alert, default_ts=None):
     """Convert Alertmanager alert to Discord embed format"""
     status = alert.get('status', 'firing')
     labels = alert.get('labels', {})
     annotations = alert.get('annotations', {})
+    labels_get = labels.get
+    annotations_get = annotations.get
     
-    severity = labels.get('severity', 'info')
-    monitor = labels.get('monitor', 'unknown')
-    alert_name = labels.get('alertname', 'Alert')
-    component = labels.get('component', 'system')
+    severity = labels_get('severity', 'info')
+    monitor = labels_get('monitor', 'unknown')
+    alert_name = labels_get('alertname', 'Alert')
+    component = labels_get('component', 'system')
     
     # Determine color
-    if status == 'resolved':
-        color = COLORS['resolved']
-        title_prefix = "✅ RESOLVED"
-    elif severity == 'critical':
-        color = COLORS['critical']
-        title_prefix = "🔥 CRITICAL"
-    elif severity == 'warning':
-        color = COLORS['warning']
-        title_prefix = "⚠️ WARNING"
-    else:
-        color = COLORS['info']
-        title_prefix = "ℹ️ INFO"
+    style_key = ('resolved', None) if status == 'resolved' else ('firing', severity)
+    color, title_prefix = _STATUS_STYLE.get(style_key, _DEFAULT_STYLE)
     
     # Build embed
+    fields = []
+    add_field = fields.append
     embed = {
         "title": f"{title_prefix}: {alert_name}",
-        "description": annotations.get('summary', f"Alert {alert_name} is {status}"),
+        "description": annotations_get('summary', f"Alert {alert_name} is {status}"),
         "color": color,
-        "fields": [],
-        "timestamp": alert.get('startsAt', datetime.utcnow().isoformat())
+        "fields": fields,
+        "timestamp": alert.get('startsAt') or default_ts or datetime.utcnow().isoformat()
     }
     
     # Add monitor info if available
     if monitor != 'unknown':
-        embed['fields'].append({
+        add_field({
             "name": "Monitor",
             "value": monitor,
             "inline": True
@@ -66,159 +141,436 @@ def format_alert_for_discord(alert):
     
     # Add component
     if component:
-        embed['fields'].append({
+        add_field({
             "name": "Component",
             "value": component,
             "inline": True
         })
     
     # Add severity
-    embed['fields'].append({
+    add_field({
         "name": "Severity",
         "value": severity.upper(),
         "inline": True
     })
     
     # Add description if available
-    description = annotations.get('description')
+    description = annotations_get('description')
     if description:
-        embed['fields'].append({
+        add_field({
             "name": "Details",
             "value": description[:1024],  # Discord limit
             "inline": False
         })
     
     # Add dashboard link if available
-    dashboard = annotations.get('dashboard')
+    dashboard = annotations_get('dashboard')
     if dashboard:
-        embed['fields'].append({
+        add_field({
             "name": "Dashboard",
             "value": f"[View Dashboard]({dashboard})",
             "inline": False
         })
     
-    # Add other labels as a field
-    other_labels = {k: v for k, v in labels.items() 
-                   if k not in ['alertname', 'severity', 'monitor', 'component']}
-    if other_labels:
-        labels_str = ', '.join([f"{k}={v}" for k, v in other_labels.items()])
-        embed['fields'].append({
+    # Add other labels as a field, stopping once the Discord limit is reached
+    parts, used = [], 0
+    for k, v in labels.items():
+        if k in _SKIP_LABELS:
+            continue
+        label = f"{k}={v}"
+        # Only labels after the first are preceded by a ', ' separator
+        cost = len(label) + 2 if parts else len(label)
+        if used + cost > 1024:
+            if not parts:
+                parts.append(label[:1024])
+            break
+        parts.append(label)
+        used += cost
+    if parts:
+        add_field({
             "name": "Labels",
-            "value": labels_str[:1024],
+            "value": ', '.join(parts),
             "inline": False
         })
     
     return embed
 
-def send_to_discord(webhook_url, alerts):
+def try_format_alert(alert, default_ts):
+    """Format one alert, logging and returning None if it is malformed"""
+    try:
+        return format_alert_for_discord(alert, default_ts=default_ts)
+    except Exception as e:
+        logger.error("Skipping malformed alert: %s", e)
+        return None
+
+async def send_to_discord(webhook_url, alerts):
     """Send alerts to Discord webhook"""
     if not webhook_url:
-        print("ERROR: DISCORD_WEBHOOK_URL not configured", file=sys.stderr)
+        logger.error("DISCORD_WEBHOOK_URL not configured")
         return False
     
-    # Group alerts by status
-    firing = [a for a in alerts if a.get('status') == 'firing']
-    resolved = [a for a in alerts if a.get('status') == 'resolved']
+    # Group alerts by status in one pass, keeping only what can be embedded
+    firing, resolved = [], []
+    firing_count = resolved_count = 0
+    for alert in alerts:
+        status = alert.get('status')
+        if status == 'firing':
+            firing_count += 1
+            if firing_count <= MAX_EMBEDS:
+                firing.append(alert)
+        elif status == 'resolved':
+            resolved_count += 1
+            if resolved_count <= MAX_EMBEDS:
+                resolved.append(alert)
     
     embeds = []
     
+    # Fallback timestamp for alerts without startsAt, read once per batch
+    batch_ts = datetime.utcnow().isoformat()
+    
     # Add firing alerts
-    for alert in firing[:10]:  # Discord limit: 10 embeds
-        embeds.append(format_alert_for_discord(alert))
+    for alert in islice(firing, MAX_EMBEDS):
+        embed = try_format_alert(alert, batch_ts)
+        if embed is None:
+            firing_count -= 1
+        else:
+            embeds.append(embed)
     
     # Add resolved alerts
-    for alert in resolved[:10 - len(embeds)]:
-        embeds.append(format_alert_for_discord(alert))
+    for alert in islice(resolved, max(0, MAX_EMBEDS - len(embeds))):
+        embed = try_format_alert(alert, batch_ts)
+        if embed is None:
+            resolved_count -= 1
+        else:
+            embeds.append(embed)
     
     if not embeds:
         return True
     
     # Build Discord webhook payload
-    payload = {
-        "username": "Hall Monitor Alerts",
-        "avatar_url": "https://raw.githubusercontent.com/prometheus/prometheus/main/documentation/images/prometheus-logo.svg",
-        "embeds": embeds
-    }
+    payload = {**_PAYLOAD_TEMPLATE, "embeds": embeds}
     
     # Add summary content
-    firing_count = len(firing)
-    resolved_count = len(resolved)
     summary_parts = []
     if firing_count:
-        summary_parts.append(f"🔥 {firing_count} alert{'s' if firing_count != 1 else ''} firing")
+        summary_parts.append(
+            _FIRING_SUMMARY.get(firing_count, _FIRING_SUMMARY_PLURAL).format(firing_count)
+        )
     if resolved_count:
         summary_parts.append(f"✅ {resolved_count} resolved")
     
     if summary_parts:
         payload["content"] = " | ".join(summary_parts)
     
+    for attempt in range(MAX_RETRIES + 1):
+        delay = BACKOFF_FACTOR * (2 ** attempt)
+        try:
+            async with SESSION.post(webhook_url, data=orjson.dumps(payload)) as response:
+                # Retry rate limits and transient server errors with backoff
+                if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    response.raise_for_status()
+                    logger.info("Successfully sent %d alerts to Discord", len(embeds))
+                    return True
+                if response.status == 429:
+                    delay = await retry_after(response, delay)
+        except aiohttp.ClientResponseError as e:
+            logger.error("Failed sending to Discord: %s", e)
+            return False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == MAX_RETRIES:
+                logger.error("Failed sending to Discord: %s", e)
+                return False
+        
+        await asyncio.sleep(delay)
+
+async def retry_after(response, default):
+    """Seconds Discord asks us to wait after a 429, capped at MAX_RETRY_AFTER"""
+    value = response.headers.get('Retry-After')
+    if value is None:
+        # Discord also reports the wait as retry_after in the JSON body
+        try:
+            value = orjson.loads(await response.read()).get('retry_after')
+        except (ValueError, AttributeError, aiohttp.ClientError):
+            pass
+    
     try:
-        response = requests.post(
-            webhook_url,
-            json=payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
-        response.raise_for_status()
-        print(f"Successfully sent {len(embeds)} alerts to Discord")
-        return True
-    except requests.exceptions.RequestException as e:
-        print(f"ERROR sending to Discord: {e}", file=sys.stderr)
-        return False
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return default
 
-class WebhookHandler(BaseHTTPRequestHandler):
-    """HTTP handler for Alertmanager webhooks"""
+def alert_key(alert):
+    """Identity used to deduplicate alerts within a batch"""
+    labels = alert.get('labels') or {}
+    identity = alert.get('fingerprint')
+    if identity is None:
+        # Without a fingerprint the full label set identifies the alert
+        identity = tuple(sorted((k, str(v)) for k, v in labels.items()))
+    return (labels.get('alertname'), identity, alert.get('status'))
+
+def parse_alerts(data):
+    """Return the webhook's alerts, or None if they can't be formatted"""
+    if not isinstance(data, dict):
+        return None
+    alerts = data.get('alerts', [])
+    if not isinstance(alerts, list):
+        return None
+    for alert in alerts:
+        if not isinstance(alert, dict):
+            return None
+        if not isinstance(alert.get('labels', {}), dict):
+            return None
+        if not isinstance(alert.get('annotations', {}), dict):
+            return None
+    return alerts
+
+def drain_alerts(queue, batch):
+    """Move all queued alerts into batch, keeping the latest per identity"""
+    while not queue.empty():
+        alert = queue.get_nowait()
+        batch[alert_key(alert)] = alert
+
+def chunk_alerts(alerts):
+    """Split alerts into Discord-sized chunks, firing before resolved"""
+    firing, resolved = [], []
+    for alert in alerts:
+        status = alert.get('status')
+        if status == 'firing':
+            firing.append(alert)
+        elif status == 'resolved':
+            resolved.append(alert)
     
-    def do_POST(self):
-        """Handle POST requests from Alertmanager"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        
-        try:
-            # Parse Alertmanager webhook payload
-            body = self.rfile.read(content_length)
-            data = json.loads(body)
-            
-            alerts = data.get('alerts', [])
-            print(f"Received {len(alerts)} alerts from Alertmanager")
-            
-            # Send to Discord
-            success = send_to_discord(DISCORD_WEBHOOK_URL, alerts)
+    ordered = firing + resolved
+    return [ordered[i:i + MAX_EMBEDS] for i in range(0, len(ordered), MAX_EMBEDS)]
+
+async def batch_alerts(queue):
+    """Coalesce queued alerts and send them in as few Discord POSTs as possible"""
+    loop = asyncio.get_running_loop()
+    last_send = 0.0
+    batch = {}
+    pending = deque()
+    
+    async def send_pending():
+        nonlocal last_send
+        while pending:
+            # Respect Discord's per-webhook rate limit
+            wait = last_send + MIN_SEND_INTERVAL - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
             
-            if success:
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"status": "ok"}).encode())
-            else:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"status": "error"}).encode())
+            # Taken off pending before sending so a cancelled POST is not resent
+            chunk = pending.popleft()
+            last_send = loop.time()
+            await send_batch(chunk)
+    
+    try:
+        while True:
+            # Block until the first alert arrives, then let the window fill up
+            first = await queue.get()
+            try:
+                batch[alert_key(first)] = first
+                await asyncio.sleep(DEBOUNCE_MS / 1000)
+                drain_alerts(queue, batch)
                 
+                pending.extend(chunk_alerts(batch.values()))
+                batch.clear()
+                await send_pending()
+            except Exception as e:
+                # Never let one bad batch stop delivery of later alerts
+                logger.exception("Batch sender failed, dropping batch: %s", e)
+                batch.clear()
+    except asyncio.CancelledError:
+        # Flush whatever is pending before shutting down
+        try:
+            drain_alerts(queue, batch)
+            pending.extend(chunk_alerts(batch.values()))
+            await send_pending()
         except Exception as e:
-            print(f"ERROR processing webhook: {e}", file=sys.stderr)
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "error", "message": str(e)}).encode())
-    
-    def do_GET(self):
-        """Handle GET requests (health check)"""
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps({
-            "status": "healthy",
-            "service": "Discord Webhook Adapter",
-            "webhook_configured": bool(DISCORD_WEBHOOK_URL)
-        }).encode())
-    
-    def log_message(self, format, *args):
-        """Custom logging"""
-        print(f"{self.address_string()} - {format % args}")
+            logger.exception("Failed flushing alerts on shutdown: %s", e)
+        raise
+
+async def send_batch(alerts):
+    """Send one chunk of alerts, logging rather than raising on failure"""
+    try:
+        await send_to_discord(DISCORD_WEBHOOK_URL, alerts)
+    except Exception as e:
+        logger.exception("Failed sending batch to Discord: %s", e)
+
+def json_response(body, status=200):
+    """Build a response from an already serialized JSON body"""
+    return web.Response(body=body, status=status, content_type='application/json')
+
+async def handle_post(request):
+    """Handle POST requests from Alertmanager"""
+    # Nowhere to send alerts, so skip parsing and formatting entirely
+    if not DISCORD_WEBHOOK_URL:
+        return json_response(_NOT_CONFIGURED, status=503)
+    
+    # Shed load instead of queueing behind slow Discord requests
+    inflight = request.app[INFLIGHT_KEY]
+    if inflight.locked():
+        return json_response(_BUSY, status=503)
+    
+    async with inflight:
+        return await process_webhook(request)
+
+async def process_webhook(request):
+    """Forward one Alertmanager webhook to Discord"""
+    # Refuse oversized bodies before reading them
+    if request.content_length is not None and request.content_length > MAX_BODY:
+        return json_response(_TOO_LARGE, status=413)
+    
+    try:
+        # Parse Alertmanager webhook payload
+        data = orjson.loads(await request.read())
+        
+        alerts = parse_alerts(data)
+        if alerts is None:
+            logger.error("Rejecting malformed webhook payload")
+            return json_response(_BAD_REQUEST, status=400)
+        logger.info("Received %d alerts from Alertmanager", len(alerts))
+        
+        # Reject the whole webhook when full so Alertmanager retries it intact
+        queue = request.app[ALERT_QUEUE_KEY]
+        if queue.qsize() >= QUEUE_MAXSIZE:
+            logger.error("Alert queue full, rejecting webhook")
+            return json_response(_BUSY, status=503)
+        
+        # Hand off to the batch sender
+        for alert in alerts:
+            queue.put_nowait(alert)
+        
+        return json_response(_QUEUED, status=202)
+            
+    except web.HTTPRequestEntityTooLarge:
+        # Chunked body that exceeded client_max_size while reading
+        return json_response(_TOO_LARGE, status=413)
+    except Exception as e:
+        logger.error("Failed processing webhook: %s", e)
+        return json_response(orjson.dumps({"status": "error", "message": str(e)}), status=500)
+
+async def handle_get(request):
+    """Handle GET requests (health check)"""
+    return json_response(_HEALTH_BODY)
+
+async def start_session(app):
+    """Create the shared outbound HTTP session"""
+    global SESSION
+    # Keep-alive pool so repeat POSTs skip the TCP and TLS handshakes
+    connector = aiohttp.TCPConnector(
+        limit=POOL_MAXSIZE,
+        limit_per_host=POOL_MAXSIZE,
+        keepalive_timeout=60
+    )
+    SESSION = aiohttp.ClientSession(
+        connector=connector,
+        headers=SESSION_HEADERS,
+        timeout=SESSION_TIMEOUT
+    )
+
+async def start_limits(app):
+    """Create the in-flight limiter on the running event loop"""
+    app[INFLIGHT_KEY] = asyncio.Semaphore(WEBHOOK_CONCURRENCY)
+
+async def start_batcher(app):
+    """Create the alert queue and start the background batch sender"""
+    app[ALERT_QUEUE_KEY] = asyncio.Queue()
+    app[BATCHER_KEY] = asyncio.create_task(batch_alerts(app[ALERT_QUEUE_KEY]))
+
+async def stop_batcher(app):
+    """Stop the batch sender, letting it flush any alerts still queued"""
+    app[BATCHER_KEY].cancel()
+    try:
+        await app[BATCHER_KEY]
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        # Keep going so the remaining cleanup hooks still close the session
+        logger.exception("Batch sender failed: %s", e)
+
+async def close_session(app):
+    """Close the shared outbound HTTP session"""
+    if SESSION is not None:
+        await SESSION.close()
+
+def create_app():
+    """Build the aiohttp application"""
+    app = web.Application(client_max_size=MAX_BODY)
+    app.router.add_post('/', handle_post)
+    app.router.add_get('/', handle_get)
+    app.on_startup.append(start_limits)
+    app.on_startup.append(start_session)
+    app.on_startup.append(start_batcher)
+    app.on_cleanup.append(stop_batcher)
+    app.on_cleanup.append(close_session)
+    return app
+
+async def main_async(port, reuse_port=False):
+    """Serve the adapter on one event loop until SIGINT or SIGTERM"""
+    runner = web.AppRunner(
+        create_app(),
+        access_log=logger,
+        access_log_format='%a - "%r" %s %b'
+    )
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, '0.0.0.0', port, reuse_port=reuse_port)
+        await site.start()
+        
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await stop.wait()
+    finally:
+        # Runs on_cleanup: flush pending alerts, then close the session
+        logger.info("Shutting down...")
+        await runner.cleanup()
+
+def run_workers(port, workers):
+    """Fork worker processes on a shared port and reap them on shutdown"""
+    children = set()
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                asyncio.run(main_async(port, reuse_port=True))
+            except BaseException:
+                logger.exception("Worker %d failed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        children.add(pid)
+    
+    def forward(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+    
+    failed = False
+    while children:
+        pid, status = os.waitpid(-1, 0)
+        children.discard(pid)
+        if os.waitstatus_to_exitcode(status) != 0:
+            # One broken worker takes the rest down so the failure is visible
+            if not failed:
+                logger.error("Worker %d exited with status %d, stopping workers",
+                             pid, os.waitstatus_to_exitcode(status))
+                failed = True
+                forward(signal.SIGTERM, None)
+    
+    if failed:
+        sys.exit(1)
 
 def main():
     """Start the webhook adapter server"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    
     if not DISCORD_WEBHOOK_URL:
         print("=" * 70)
         print("ERROR: DISCORD_WEBHOOK_URL environment variable not set!")
@@ -235,7 +587,6 @@ def main():
         sys.exit(1)
     
     port = int(os.environ.get('WEBHOOK_PORT', 5001))
-    server = HTTPServer(('0.0.0.0', port), WebhookHandler)
     
     print("=" * 70)
     print(f"Discord Webhook Adapter for Alertmanager")
@@ -243,15 +594,15 @@ def main():
     print(f"Listening on: http://0.0.0.0:{port}")
     print(f"Health check: http://localhost:{port}/")
     print(f"Discord webhook: {'✅ Configured' if DISCORD_WEBHOOK_URL else '❌ Not configured'}")
+    print(f"Workers: {WEBHOOK_WORKERS}")
     print("=" * 70)
     print("Waiting for alerts from Alertmanager...")
     print()
     
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        print("\nShutting down...")
-        server.shutdown()
+    if WEBHOOK_WORKERS > 1:
+        run_workers(port, WEBHOOK_WORKERS)
+    else:
+        asyncio.run(main_async(port))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,114 @@
+"""
+Tests for the Discord Webhook Adapter
+Run with: python -m unittest test_discord_webhook_adapter.py
+"""
+
+import asyncio
+import importlib.util
+import os
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+# The adapter is a script with a hyphenated filename, so load it by path
+_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discord-webhook-adapter.py')
+_SPEC = importlib.util.spec_from_file_location('discord_webhook_adapter', _PATH)
+adapter = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(adapter)
+
+GOOD_ALERT = {
+    "status": "firing",
+    "fingerprint": "good",
+    "labels": {"alertname": "MonitorDown", "severity": "critical"},
+    "annotations": {"summary": "gitlab is down"}
+}
+
+
+class AdapterTestCase(unittest.IsolatedAsyncioTestCase):
+    """Runs the adapter against a fake Discord webhook endpoint"""
+
+    async def asyncSetUp(self):
+        self.received = []
+
+        async def discord(request):
+            self.received.append(await request.json())
+            return web.Response(status=204)
+
+        discord_app = web.Application()
+        discord_app.router.add_post('/webhook', discord)
+        self.discord = TestServer(discord_app)
+        await self.discord.start_server()
+
+        self.patches = {
+            'DISCORD_WEBHOOK_URL': str(self.discord.make_url('/webhook')),
+            'DEBOUNCE_MS': 0,
+            'MIN_SEND_INTERVAL': 0,
+        }
+        self.saved = {name: getattr(adapter, name) for name in self.patches}
+        for name, value in self.patches.items():
+            setattr(adapter, name, value)
+
+        self.app = adapter.create_app()
+        self.client = TestClient(TestServer(self.app))
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.discord.close()
+        for name, value in self.saved.items():
+            setattr(adapter, name, value)
+
+    async def wait_for_delivery(self, count=1):
+        """Wait until Discord has received count POSTs"""
+        for _ in range(100):
+            if len(self.received) >= count:
+                return
+            await asyncio.sleep(0.02)
+        self.fail(f"expected {count} Discord POSTs, got {len(self.received)}")
+
+    async def test_malformed_alert_is_rejected(self):
+        resp = await self.client.post('/', json={"alerts": [{"labels": None, "status": "firing"}]})
+        self.assertEqual(resp.status, 400)
+
+        resp = await self.client.post('/', json={"alerts": [GOOD_ALERT]})
+        self.assertEqual(resp.status, 202)
+
+        await self.wait_for_delivery()
+        self.assertEqual(self.received[0]["embeds"][0]["title"], "🔥 CRITICAL: MonitorDown")
+
+    async def test_batcher_survives_bad_alert(self):
+        # Bypass request validation to hit the batch sender directly
+        queue = self.app[adapter.ALERT_QUEUE_KEY]
+        queue.put_nowait({"labels": None, "status": "firing"})
+        await asyncio.sleep(0.05)
+
+        queue.put_nowait(GOOD_ALERT)
+        await self.wait_for_delivery()
+        self.assertEqual(len(self.received[-1]["embeds"]), 1)
+        self.assertFalse(self.app[adapter.BATCHER_KEY].done())
+
+    async def test_bad_alert_only_drops_itself(self):
+        queue = self.app[adapter.ALERT_QUEUE_KEY]
+        for i in range(3):
+            queue.put_nowait({**GOOD_ALERT, "fingerprint": f"good{i}"})
+        queue.put_nowait({"status": "firing", "fingerprint": "bad", "annotations": None})
+
+        await self.wait_for_delivery()
+        self.assertEqual(len(self.received[0]["embeds"]), 3)
+        self.assertEqual(self.received[0]["content"], "🔥 3 alerts firing")
+
+    async def test_alerts_without_fingerprint_are_deduplicated_by_labels(self):
+        alerts = [
+            {"status": "firing", "labels": {"alertname": "A", "instance": f"h{i}"}}
+            for i in (0, 1, 2, 0)
+        ]
+        resp = await self.client.post('/', json={"alerts": alerts})
+        self.assertEqual(resp.status, 202)
+
+        await self.wait_for_delivery()
+        self.assertEqual(len(self.received[0]["embeds"]), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()